@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     CSV_PATH: Path = Path(__file__).parent / "parenting_articles.csv"
     CHROMA_DIR: Path = Path(os.getenv("CHROMA_DIR", str(ROOT_DIR / "chroma_db")))
     CHROMA_COLLECTION: str = "parenting_articles"
+    # FAISS sidecar artifacts written at build time (see vectorstore_build)
+    EMBS_FILE: Path = ROOT_DIR / "embs.npy"
+    META_FILE: Path = ROOT_DIR / "faiss_meta.parquet"
 
     # Embedding model (HF SentenceTransformer)
     EMBEDDING_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
@@ -32,6 +35,8 @@ class Settings(BaseSettings):
 
     # Retrieval
     DEFAULT_TOP_K: int = 3
+    RAG_CACHE_DIR: Path = Path(__file__).parent / ".rag_cache"
+    RAG_CACHE_TTL: int = 7 * 24 * 3600  # seconds a cached retrieval stays valid
 
     # Prompt template
     PROMPT_TEMPLATE: str = (
@@ -3,17 +3,115 @@
 Provides a simple interface .embed_documents(List[str]) and .embed_query(str).
 """
 from __future__ import annotations
+import functools
+from pathlib import Path
 from typing import List
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 from config import EMBEDDING_MODEL_NAME
 
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+ENCODE_BATCH_SIZE = 64
+
+# One-time export for the fast query path:
+#   optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 ./onnx_minilm
+ONNX_MODEL_DIR = Path(__file__).parent / "onnx_minilm"
+
+
+@functools.lru_cache(maxsize=1)
+def _onnx_session():
+    """Load the exported ONNX model + tokenizer for single-query encoding.
+
+    PyTorch's fixed per-call overhead dominates at batch size 1; ONNX Runtime
+    is several times faster there. Returns (session, tokenizer) or None when
+    onnxruntime or the export directory is missing, in which case embed_query
+    falls back to the torch model.
+    """
+    if ort is None or not (ONNX_MODEL_DIR / "model.onnx").exists():
+        return None
+    from transformers import AutoTokenizer
+    providers = ["CPUExecutionProvider"]
+    if "CUDAExecutionProvider" in ort.get_available_providers():
+        providers.insert(0, "CUDAExecutionProvider")
+    session = ort.InferenceSession(str(ONNX_MODEL_DIR / "model.onnx"), providers=providers)
+    tokenizer = AutoTokenizer.from_pretrained(ONNX_MODEL_DIR)
+    return session, tokenizer
+
+
+@functools.lru_cache(maxsize=2)
+def _load_model(model_name: str, device: str) -> SentenceTransformer:
+    """Load the model once per process.
+
+    Every EmbeddingsWrapper shares this copy, and on POSIX any fork()ed
+    worker inherits the weights via copy-on-write pages instead of reloading
+    ~90MB from disk.
+    """
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        # fp16 halves memory bandwidth; MiniLM is robust to half precision
+        model.half()
+    return model
+
+
 class EmbeddingsWrapper:
     def __init__(self, model_name: str = EMBEDDING_MODEL_NAME):
         self.model_name = model_name
-        self.model = SentenceTransformer(model_name)
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.model = _load_model(model_name, self.device)
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in length-sorted mini-batches (SBERT smart batching).
+
+        Sorting by length groups similar-sized texts per batch, so padding
+        waste is minimal; the permutation is inverted afterwards to restore
+        the original order.
+        """
+        if not texts:
+            dim = self.model.get_sentence_embedding_dimension()
+            return np.empty((0, dim), dtype=np.float32)
+        order = np.argsort([len(t) for t in texts])
+        with torch.inference_mode():
+            embs = self.model.encode(
+                [texts[i] for i in order],
+                batch_size=ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        inv = np.empty_like(order)
+        inv[order] = np.arange(len(order))
+        return embs[inv].astype(np.float32, copy=False)
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return self.model.encode(texts, show_progress_bar=False).tolist()
+    def embed_query(self, text: str) -> np.ndarray:
+        loaded = _onnx_session()
+        if loaded is not None:
+            session, tokenizer = loaded
+            # Truncate at SBERT's window (256), not the tokenizer's default
+            # model_max_length (512), so both query paths embed identically
+            enc = tokenizer(
+                [text],
+                return_tensors="np",
+                truncation=True,
+                max_length=self.model.max_seq_length,
+            )
+            input_names = {i.name for i in session.get_inputs()}
+            hidden = session.run(None, {k: v for k, v in enc.items() if k in input_names})[0]
+            # Mean-pool over tokens, then L2-normalize (matches SBERT pooling)
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            emb = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+            return emb[0].astype(np.float32, copy=False)
 
-    def embed_query(self, text: str) -> List[float]:
-        return self.model.encode([text], show_progress_bar=False)[0].tolist()
+        with torch.inference_mode():
+            emb = self.model.encode(
+                [text],
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        return emb[0].astype(np.float32, copy=False)
@@ -2,16 +2,21 @@
 Gracefully degrades if API key missing or authentication fails.
 """
 from __future__ import annotations
+import asyncio
+import functools
 import os
 from typing import List
-from openai import OpenAI
-from config import OPENROUTER_ENV_VAR, LLM_MODEL
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from config import OPENROUTER_ENV_VAR, LLM_MODEL, HTTP_TIMEOUT
 
 FALLBACK_ANSWER = (
     "[LLM unavailable] Unable to retrieve a model-generated answer right now. "
     "Please verify your OPENROUTER_API_KEY or internet connectivity."
 )
 
+_POOL_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
 class LLMClient:
     def __init__(self):
         self.api_key = os.getenv(OPENROUTER_ENV_VAR)
@@ -19,7 +24,11 @@ class LLMClient:
         self._client = None
         if self.api_key:
             try:
-                self._client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+                self._client = OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=httpx.Client(limits=_POOL_LIMITS, timeout=HTTP_TIMEOUT),
+                )
             except Exception as e:
                 print(f"Failed to init OpenAI client: {e}")
                 self._client = None
@@ -41,3 +50,68 @@ class LLMClient:
         except Exception as e:
             print(f"LLM request failed: {e}")
             return FALLBACK_ANSWER
+
+    def _make_async_client(self):
+        """Build an AsyncOpenAI client bound to the currently running loop.
+
+        Async connections cannot outlive their event loop, so each batch
+        creates (and closes) its own pooled client instead of caching one
+        across asyncio.run() calls.
+        """
+        if not self.api_key:
+            return None
+        try:
+            return AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=httpx.AsyncClient(limits=_POOL_LIMITS, timeout=HTTP_TIMEOUT),
+            )
+        except Exception as e:
+            print(f"Failed to init async OpenAI client: {e}")
+            return None
+
+    async def _achat_with(self, client: AsyncOpenAI, prompt: str) -> str:
+        try:
+            resp = await client.chat.completions.create(
+                model=LLM_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            choice = resp.choices[0]
+            content = getattr(choice.message, "content", None) or getattr(choice, "text", "")
+            return content.strip()
+        except Exception as e:
+            print(f"LLM request failed: {e}")
+            return FALLBACK_ANSWER
+
+    async def achat(self, prompt: str) -> str:
+        """Async counterpart of chat; one-shot client for the current loop."""
+        client = self._make_async_client()
+        if client is None:
+            return FALLBACK_ANSWER
+        try:
+            return await self._achat_with(client, prompt)
+        finally:
+            await client.close()
+
+    async def abatch(self, prompts: List[str], concurrency: int = 20) -> List[str]:
+        """Run many prompts concurrently over one shared pooled client,
+        capped by a semaphore."""
+        client = self._make_async_client()
+        if client is None:
+            return [FALLBACK_ANSWER] * len(prompts)
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(prompt: str) -> str:
+            async with sem:
+                return await self._achat_with(client, prompt)
+
+        try:
+            return list(await asyncio.gather(*[_one(p) for p in prompts]))
+        finally:
+            await client.close()
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_client() -> LLMClient:
+    """Process-wide LLMClient so TCP/TLS connections are set up once and reused."""
+    return LLMClient()
@@ -1,8 +1,9 @@
 """Process PDFs and text files from data/ directory using LangChain.
 
-Extracts text from PDFs with pdfplumber, loads .txt files, cleans text,
-chunks into semantic units with RecursiveCharacterTextSplitter, and returns
-LangChain Document objects ready for embedding/vector store ingestion.
+Extracts text from PDFs with pypdfium2 (pdfplumber fallback), loads .txt files,
+cleans text, chunks into token-aligned units with
+SentenceTransformersTokenTextSplitter, and returns LangChain Document objects
+ready for embedding/vector store ingestion.
 
 Usage:
     python process_pdfs.py
@@ -10,38 +11,82 @@ Usage:
 Returns a list of Document objects with metadata (source file, chunk index).
 """
 from __future__ import annotations
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 try:
     import pdfplumber
 except ImportError:
-    print("pdfplumber not installed. Run: pip install pdfplumber")
     pdfplumber = None
 
+if pdfium is None and pdfplumber is None:
+    print("No PDF backend installed. Run: pip install pypdfium2 (or pdfplumber)")
+
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_text_splitters import SentenceTransformersTokenTextSplitter
+
+from config import DATA_DIR, EMBEDDING_MODEL_NAME
+
+# Token-based chunking aligned with the embedder: MiniLM truncates at 256
+# tokens including the [CLS]/[SEP] specials added at encode time, so content
+# is capped at 254 tokens so chunks never get silently cut
+TOKENS_PER_CHUNK = 254
+TOKEN_CHUNK_OVERLAP = 32
+
+print(f"Using TOKENS_PER_CHUNK={TOKENS_PER_CHUNK}, TOKEN_CHUNK_OVERLAP={TOKEN_CHUNK_OVERLAP}")
+
+# Compiled once at import time; clean_text runs per document on the hot path.
+# A single alternation handles both whitespace collapses in one pass, and
+# control characters are stripped with str.translate (C-level, no regex).
+_RE_WS = re.compile(r" {2,}|\n{3,}")
+_CTRL_TABLE = dict.fromkeys(
+    list(range(0, 9)) + [11, 12] + list(range(14, 32)) + [127], None
+)
+
+
+def _collapse_ws(match: re.Match) -> str:
+    return " " if match.group(0)[0] == " " else "\n\n"
 
-from config import DATA_DIR, CHUNK_SIZE, CHUNK_OVERLAP
 
-print(f"Using CHUNK_SIZE={CHUNK_SIZE}, CHUNK_OVERLAP={CHUNK_OVERLAP}")
 def extract_text_from_pdf(pdf_path: Path) -> str:
-    """Extract all text from a PDF file using pdfplumber."""
-    if pdfplumber is None:
-        raise ImportError("pdfplumber is required for PDF processing")
-    
+    """Extract all text from a PDF file.
+
+    Prefers pypdfium2 (C-backed, much faster for plain text extraction);
+    falls back to pdfplumber if pypdfium2 is unavailable.
+    """
+    if pdfium is None and pdfplumber is None:
+        raise ImportError("pypdfium2 or pdfplumber is required for PDF processing")
+
     text_parts = []
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                for page in pdf:
+                    page_text = page.get_textpage().get_text_range()
+                    if page_text:
+                        text_parts.append(page_text)
+            finally:
+                pdf.close()
+        else:
+            with pdfplumber.open(pdf_path) as pdf:
+                for page in pdf.pages:
+                    page_text = page.extract_text()
+                    if page_text:
+                        text_parts.append(page_text)
     except Exception as e:
         print(f"Error extracting text from {pdf_path}: {e}")
         return ""
-    
+
     return "\n\n".join(text_parts)
 
 
@@ -57,12 +102,11 @@ def load_text_file(txt_path: Path) -> str:
 
 def clean_text(text: str) -> str:
     """Clean extracted text: normalize whitespace, remove artifacts, etc."""
-    # Collapse multiple spaces
-    text = re.sub(r" {2,}", " ", text)
-    # Collapse multiple newlines
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    # Remove common PDF artifacts (optional, adjust as needed)
-    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text)
+    # Remove common PDF artifacts first so stray control chars cannot
+    # shield whitespace runs from the collapse below
+    text = text.translate(_CTRL_TABLE)
+    # Collapse multiple spaces / newlines in a single pass
+    text = _RE_WS.sub(_collapse_ws, text)
     return text.strip()
 
 
@@ -73,11 +117,23 @@ def load_all_documents() -> List[Document]:
         return []
     
     documents = []
-    
-    # Load PDFs
-    for pdf_file in DATA_DIR.glob("*.pdf"):
+
+    # Load PDFs - extraction is CPU-bound and independent per file, so fan
+    # out one task per PDF across a process pool
+    pdf_files = list(DATA_DIR.glob("*.pdf"))
+    if pdf_files:
+        max_workers = min(len(pdf_files), os.cpu_count() or 1)
+        # fork (where available) gives workers the parent's already-imported
+        # modules and any loaded model weights as copy-on-write pages instead
+        # of re-importing/reloading per worker; Windows/macOS fall back to spawn
+        start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        mp_context = multiprocessing.get_context(start_method)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+            raw_texts = list(executor.map(extract_text_from_pdf, pdf_files))
+    else:
+        raw_texts = []
+    for pdf_file, raw_text in zip(pdf_files, raw_texts):
         print(f"Processing PDF: {pdf_file.name}")
-        raw_text = extract_text_from_pdf(pdf_file)
         if raw_text:
             cleaned = clean_text(raw_text)
             if len(cleaned) > 100:  # Skip nearly empty docs
@@ -104,17 +160,21 @@ def load_all_documents() -> List[Document]:
     return documents
 
 
-def chunk_documents(documents: List[Document], chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP) -> List[Document]:
-    """Split documents into smaller chunks using RecursiveCharacterTextSplitter."""
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
+def chunk_documents(documents: List[Document], tokens_per_chunk: int = TOKENS_PER_CHUNK, chunk_overlap: int = TOKEN_CHUNK_OVERLAP) -> List[Document]:
+    """Split documents on token boundaries using the embedder's own tokenizer.
+
+    Tokenizes each document once and splits on token-id arrays instead of
+    repeated substring scans, and keeps every chunk within the embedder's
+    sequence window.
+    """
+    text_splitter = SentenceTransformersTokenTextSplitter(
+        model_name=EMBEDDING_MODEL_NAME,
+        tokens_per_chunk=tokens_per_chunk,
         chunk_overlap=chunk_overlap,
-        length_function=len,
-        separators=["\n\n", "\n", ". ", " ", ""]
     )
-    
+
     chunks = text_splitter.split_documents(documents)
-    print(f"Split into {len(chunks)} chunks (chunk_size={chunk_size}, overlap={chunk_overlap})")
+    print(f"Split into {len(chunks)} chunks (tokens_per_chunk={tokens_per_chunk}, overlap={chunk_overlap})")
     
     # Add chunk index to metadata
     for i, chunk in enumerate(chunks):
@@ -135,6 +195,18 @@ def save_chunks_to_csv(chunks, output_path="chunks.csv"):
                 c.page_content
             ])
     print(f"Saved {len(chunks)} chunks to {output_path}")
+def save_chunks_to_parquet(chunks, output_path="chunks.parquet"):
+    """Save chunks as a columnar Parquet file (much faster to reload than JSONL)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    table = pa.Table.from_pydict({
+        "chunk_id": [c.metadata.get("chunk_id") for c in chunks],
+        "source": [c.metadata.get("source") for c in chunks],
+        "type": [c.metadata.get("type") for c in chunks],
+        "content": [c.page_content for c in chunks],
+    })
+    pq.write_table(table, output_path, compression="zstd")
+    print(f"Saved {len(chunks)} chunks to {output_path}")
 def save_chunks_to_jsonl(chunks, output_path="chunks.jsonl"):
     import json
     with open(output_path, "w", encoding="utf-8") as f:
@@ -180,6 +252,10 @@ if __name__ == "__main__":
     chunks = main()
     print(f"\n✅ Processed {len(chunks)} total chunks ready for vector store.")
     #save_chunks_to_csv(chunks, output_path="chunks.csv")
-    save_chunks_to_jsonl(chunks, output_path="chunks.jsonl")
+    try:
+        save_chunks_to_parquet(chunks, output_path="chunks.parquet")
+    except ImportError:
+        print("pyarrow not installed; falling back to JSONL. Run: pip install pyarrow")
+        save_chunks_to_jsonl(chunks, output_path="chunks.jsonl")
     
     #print(chunks[:5])
\ No newline at end of file
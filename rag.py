@@ -1,18 +1,148 @@
 """RAG pipeline logic: retrieve relevant chunks then ask LLM.
 """
 from __future__ import annotations
+import asyncio
+import functools
+import io
 from typing import Dict, Any, List
-import chromadb
-from config import CHROMA_DIR, CHROMA_COLLECTION, DEFAULT_TOP_K, PROMPT_TEMPLATE
-from llm import LLMClient
+from config import (
+    CHROMA_DIR,
+    CHROMA_COLLECTION,
+    DEFAULT_TOP_K,
+    EMBEDDING_MODEL_NAME,
+    EMBS_FILE,
+    META_FILE,
+    PROMPT_TEMPLATE,
+    RAG_CACHE_DIR,
+    RAG_CACHE_TTL,
+)
+from llm import get_llm_client
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
+try:
+    import xxhash
+    _hexdigest = xxhash.xxh3_64_hexdigest
+except ImportError:
+    import hashlib
+
+    def _hexdigest(s: str) -> str:
+        return hashlib.md5(s.encode("utf-8")).hexdigest()
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Max tokens kept per retrieved chunk when building the prompt
+SNIPPET_TOKENS = 250
+
+
+@functools.lru_cache(maxsize=1)
+def _client():
+    # Shared factory: Chroma raises if two clients on the same path use
+    # different settings, so never construct a PersistentClient directly here
+    from vectorstore_build import chroma_client
+    return chroma_client()
+
+
+@functools.lru_cache(maxsize=1)
 def get_collection():
-    client = chromadb.PersistentClient(path=str(CHROMA_DIR))
-    return client.get_collection(CHROMA_COLLECTION)
+    """Cached collection handle; opening the client re-reads sqlite and HNSW
+    metadata, which would otherwise dominate per-query latency."""
+    return _client().get_collection(CHROMA_COLLECTION)
+
+
+@functools.lru_cache(maxsize=1)
+def _embedder():
+    from embeddings import EmbeddingsWrapper
+    return EmbeddingsWrapper()
+
+
+@functools.lru_cache(maxsize=1)
+def _faiss_index(fingerprint: str):
+    """Load the FAISS exact inner-product index from the build sidecar files.
+
+    The caller passes the current _index_fingerprint() so the memoized index
+    is keyed to the on-disk state: a rebuild changes the fingerprint, evicts
+    the stale in-memory index, and forces a reload here.
+
+    Returns (index, metadata rows) or None when FAISS or the sidecar files
+    are unavailable, in which case retrieval falls back to Chroma.
+    """
+    if faiss is None:
+        return None
+    if not (EMBS_FILE.exists() and META_FILE.exists()):
+        return None
+    import numpy as np
+    import pyarrow.parquet as pq
+    embs = np.load(EMBS_FILE).astype(np.float32, copy=False)
+    index = faiss.IndexFlatIP(embs.shape[1])
+    index.add(embs)
+    meta = pq.read_table(META_FILE).to_pylist()
+    return index, meta
+
+
+@functools.lru_cache(maxsize=1)
+def _retrieval_cache():
+    if diskcache is None:
+        return None
+    return diskcache.Cache(str(RAG_CACHE_DIR))
+
+
+def _index_fingerprint() -> str:
+    """Stat-based fingerprint of the current index.
+
+    Changes whenever the FAISS sidecar (or, in the Chroma fallback, the
+    sqlite store) is rebuilt, so cached retrievals from an older corpus are
+    never served after a --rebuild.
+    """
+    for path in (EMBS_FILE, CHROMA_DIR / "chroma.sqlite3"):
+        if path.exists():
+            st = path.stat()
+            return f"{st.st_mtime_ns}-{st.st_size}"
+    return "0"
+
+
+def _cache_key(query: str, k: int) -> str:
+    # Versioned by embedding model and index fingerprint so swapping models
+    # or rebuilding the corpus invalidates old entries
+    return f"{EMBEDDING_MODEL_NAME}:{_index_fingerprint()}:{k}:{_hexdigest(query.strip().lower())}"
 
 
 def retrieve(query: str, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    cache = _retrieval_cache()
+    if cache is None:
+        return _retrieve_uncached(query, k)
+    key = _cache_key(query, k)
+    docs = cache.get(key)
+    if docs is None:
+        docs = _retrieve_uncached(query, k)
+        cache.set(key, docs, expire=RAG_CACHE_TTL)
+    return docs
+
+
+def _retrieve_uncached(query: str, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    # Fast path: exact inner-product search over normalized vectors in FAISS
+    loaded = _faiss_index(_index_fingerprint())
+    if loaded is not None:
+        index, meta = loaded
+        q = _embedder().embed_query(query)
+        _, hits = index.search(q[None, :], k)
+        return [
+            {"id": meta[i]["id"], "text": meta[i]["content"], "source": meta[i]["source"]}
+            for i in hits[0]
+            if i >= 0
+        ]
+
     collection = get_collection()
     # Using Chroma similarity search
     results = collection.query(query_texts=[query], n_results=k)
@@ -26,18 +156,72 @@ def retrieve(query: str, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
     return docs
 
 
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    return tiktoken.get_encoding("cl100k_base") if tiktoken is not None else None
+
+
+def _truncate_snippet(text: str) -> str:
+    """Cap a source snippet at SNIPPET_TOKENS tokens (LLM tokens, not chars),
+    so prompt size is bounded by what the model actually counts."""
+    enc = _encoding()
+    if enc is None:
+        return text[:1000]  # char fallback, matches old behavior
+    tokens = enc.encode(text)
+    if len(tokens) <= SNIPPET_TOKENS:
+        return text
+    return enc.decode(tokens[:SNIPPET_TOKENS])
+
+
 def build_prompt(question: str, docs: List[Dict[str, Any]]) -> str:
-    sources_formatted = []
-    for d in docs:
-        sources_formatted.append(f"[ID: {d['id']}]\n{d['text'][:1000]}")  # truncate for prompt length
-    sources_block = "\n\n".join(sources_formatted)
-    return PROMPT_TEMPLATE.format(question=question, sources=sources_block)
+    buf = io.StringIO()
+    for i, d in enumerate(docs):
+        if i:
+            buf.write("\n\n")
+        buf.write(f"[ID: {d['id']}]\n")
+        buf.write(_truncate_snippet(d["text"]))
+    return PROMPT_TEMPLATE.format(question=question, sources=buf.getvalue())
+
+
+def retrieve_batch(queries: List[str], k: int = DEFAULT_TOP_K) -> List[List[Dict[str, Any]]]:
+    """Retrieve chunks for many queries at once.
+
+    With FAISS available, all queries are embedded in one SentenceTransformer
+    batch and searched in a single matrix call; otherwise falls back to
+    per-query retrieval.
+    """
+    loaded = _faiss_index(_index_fingerprint())
+    if loaded is None:
+        return [retrieve(q, k=k) for q in queries]
+    index, meta = loaded
+    q_embs = _embedder().embed_documents(queries)
+    _, hits = index.search(q_embs, k)
+    return [
+        [
+            {"id": meta[i]["id"], "text": meta[i]["content"], "source": meta[i]["source"]}
+            for i in row
+            if i >= 0
+        ]
+        for row in hits
+    ]
+
+
+def answer_batch(questions: List[str], k: int = DEFAULT_TOP_K, concurrency: int = 20) -> List[Dict[str, Any]]:
+    """Answer many questions: one batched retrieval, then concurrent LLM calls."""
+    docs_per_q = retrieve_batch(questions, k=k)
+    prompts = [build_prompt(q, docs) for q, docs in zip(questions, docs_per_q)]
+    llm = get_llm_client()
+    responses = asyncio.run(llm.abatch(prompts, concurrency=concurrency))
+    return [
+        {"question": q, "chunks": docs, "answer": resp, "prompt": prompt}
+        for q, docs, resp, prompt in zip(questions, docs_per_q, responses, prompts)
+    ]
 
 
 def answer(question: str, k: int = DEFAULT_TOP_K) -> Dict[str, Any]:
     docs = retrieve(question, k=k)
     prompt = build_prompt(question, docs)
-    llm = LLMClient()
+    llm = get_llm_client()
     response_text = llm.chat(prompt)
     return {
         "question": question,
@@ -8,23 +8,30 @@ Usage (PowerShell):
     python scrape_sources.py --max-pages 30 --max-docs 20 --delay 1.0
 
 Notes:
-- This is a conservative scraper: small crawl, polite delay.
+- This is a conservative scraper: small crawl, polite per-host delay,
+  bounded concurrency (fetches overlap across hosts via aiohttp/asyncio).
 - Text files are saved with UTF-8 encoding for maximum compatibility.
 """
 from __future__ import annotations
 import os
 import re
-import time
 import math
+import asyncio
 import hashlib
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Set, List, Tuple
+from typing import Dict, Set, List, Tuple
 from urllib.parse import urljoin, urlparse
 
-import requests
+import aiohttp
 from bs4 import BeautifulSoup
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
 from config import DATA_DIR
 
 HEADERS = {
@@ -71,11 +78,10 @@ def keyword_relevant(url: str) -> bool:
     return any(k in lower for k in KEYWORDS)
 
 
-def extract_links(base_url: str, html: str) -> List[str]:
-    soup = BeautifulSoup(html, "html.parser")
+def _filter_links(base_url: str, hrefs: List[str]) -> List[str]:
     links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
+    for href in hrefs:
+        href = href.strip()
         if href.startswith("#") or href.startswith("javascript:"):
             continue
         full = urljoin(base_url, href)
@@ -85,17 +91,58 @@ def extract_links(base_url: str, html: str) -> List[str]:
     return list(dict.fromkeys(links))  # dedupe preserve order
 
 
-def fetch(url: str, timeout: float = 20.0) -> Tuple[int, str]:
-    resp = requests.get(url, headers=HEADERS, timeout=timeout)
-    return resp.status_code, resp.text
+def parse_page(base_url: str, html: str) -> Tuple[str, str, List[str]]:
+    """Extract main text, page title, and in-scope links in a single parse.
+
+    Uses selectolax (C-backed, much faster) when installed; falls back to
+    BeautifulSoup's html.parser otherwise.
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        title_node = tree.css_first("title")
+        title = title_node.text(strip=True) if title_node else ""
+        container = tree.css_first("article") or tree.css_first("main") or tree.css_first("body") or tree.root
+        paragraphs = []
+        for node in container.css("p, li, h1, h2, h3, h4"):
+            text = node.text(separator=" ", strip=True)
+            if text:
+                paragraphs.append(text)
+        hrefs = [a.attributes.get("href") or "" for a in tree.css("a[href]")]
+    else:
+        soup = BeautifulSoup(html, "html.parser")
+        title_tag = soup.find("title")
+        title = title_tag.get_text(strip=True) if title_tag else ""
+        # Prefer article/main content if present
+        article = soup.find("article") or soup.find("main")
+        container = article or soup.body or soup
+        paragraphs = []
+        for p in container.find_all(["p", "li", "h1", "h2", "h3", "h4"]):
+            text = p.get_text(separator=" ", strip=True)
+            if len(text) > 0:
+                paragraphs.append(text)
+        hrefs = [a["href"] for a in soup.find_all("a", href=True)]
+
+    text = "\n\n".join(paragraphs)
+    # Collapse overlong whitespace
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text, title, _filter_links(base_url, hrefs)
+
+
+MAX_CONCURRENCY = 10
+PARSE_WORKERS = 8
+
 
+async def fetch(session: aiohttp.ClientSession, url: str, timeout: float = 20.0) -> Tuple[int, str]:
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+        return resp.status, await resp.text()
 
-def download_pdf(url: str, out_path: Path) -> bool:
+
+async def download_pdf(session: aiohttp.ClientSession, url: str, out_path: Path) -> bool:
     try:
-        with requests.get(url, headers=HEADERS, stream=True, timeout=30) as r:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as r:
             r.raise_for_status()
             with open(out_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
+                async for chunk in r.content.iter_chunked(8192):
                     if chunk:
                         f.write(chunk)
         return True
@@ -104,22 +151,6 @@ def download_pdf(url: str, out_path: Path) -> bool:
         return False
 
 
-def extract_text_from_html(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    # Prefer article/main content if present
-    article = soup.find("article") or soup.find("main")
-    container = article or soup.body or soup
-    paragraphs = []
-    for p in container.find_all(["p", "li", "h1", "h2", "h3", "h4"]):
-        text = p.get_text(separator=" ", strip=True)
-        if len(text) > 0:
-            paragraphs.append(text)
-    text = "\n\n".join(paragraphs)
-    # Collapse overlong whitespace
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text
-
-
 def save_text_to_file(text: str, out_path: Path, title: str | None = None):
     """Save text content to a plain .txt file with UTF-8 encoding."""
     out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -137,7 +168,48 @@ def unique_output_path(base_name: str, extension: str = ".txt") -> Path:
     return DATA_DIR / f"{fname}-{h}{extension}"
 
 
-def crawl_and_save(max_pages: int, max_docs: int, delay: float) -> List[Path]:
+async def _fetch_one(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    host_locks: Dict[str, asyncio.Lock],
+    parse_pool: ThreadPoolExecutor,
+    delay: float,
+    url: str,
+):
+    """Fetch a single URL (page or PDF) politely: global concurrency cap via
+    the semaphore, and requests to the same host serialized with a delay.
+
+    HTML is parsed on the thread pool right after download, so parsing one
+    page overlaps with fetching the others (the C parsers release the GIL).
+    """
+    host = urlparse(url).netloc.lower()
+    lock = host_locks.setdefault(host, asyncio.Lock())
+    async with sem, lock:
+        print(f"Fetching: {url}")
+        try:
+            if is_pdf_url(url):
+                base_name = Path(urlparse(url).path).name or "document"
+                out_path = unique_output_path(base_name, extension=".pdf")
+                ok = await download_pdf(session, url, out_path)
+                result = ("pdf", out_path if ok else None, None)
+            else:
+                status, html = await fetch(session, url)
+                if status == 200:
+                    loop = asyncio.get_running_loop()
+                    parsed = await loop.run_in_executor(parse_pool, parse_page, url, html)
+                else:
+                    parsed = None
+                result = ("html", status, parsed)
+        except Exception as e:
+            print(f"Error processing {url}: {e}")
+            result = ("error", None, None)
+        if delay > 0:
+            # Politeness delay per host, overlapped with other hosts
+            await asyncio.sleep(delay)
+        return result
+
+
+async def _crawl_and_save(max_pages: int, max_docs: int, delay: float) -> List[Path]:
     DATA_DIR.mkdir(exist_ok=True, parents=True)
 
     visited: Set[str] = set()
@@ -147,32 +219,43 @@ def crawl_and_save(max_pages: int, max_docs: int, delay: float) -> List[Path]:
     saved: List[Path] = []
     pages_processed = 0
 
-    while queue and pages_processed < max_pages and len(saved) < max_docs:
-        url = queue.pop(0)
-        if url in visited:
-            continue
-        visited.add(url)
-
-        try:
-            print(f"Fetching: {url}")
-            if is_pdf_url(url):
-                # Direct PDF link - download as PDF
-                base_name = Path(urlparse(url).path).name or "document"
-                out_path = unique_output_path(base_name, extension=".pdf")
-                if download_pdf(url, out_path):
-                    print(f"Saved PDF: {out_path}")
-                    saved.append(out_path)
-            else:
-                status, html = fetch(url)
-                if status != 200:
-                    print(f"Non-200 status {status} for {url}")
-                else:
-                    text = extract_text_from_html(html)
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    host_locks: Dict[str, asyncio.Lock] = {}
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY)
+    parse_pool = ThreadPoolExecutor(max_workers=PARSE_WORKERS)
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+        while queue and pages_processed < max_pages and len(saved) < max_docs:
+            # Take a wave of URLs and fetch them concurrently
+            batch: List[str] = []
+            while queue and len(batch) < MAX_CONCURRENCY and pages_processed + len(batch) < max_pages:
+                url = queue.pop(0)
+                if url in visited:
+                    continue
+                visited.add(url)
+                batch.append(url)
+            if not batch:
+                break
+
+            results = await asyncio.gather(
+                *[_fetch_one(session, sem, host_locks, parse_pool, delay, u) for u in batch]
+            )
+            pages_processed += len(batch)
+
+            # Process responses sequentially: save docs, enqueue new links
+            for url, (kind, value, parsed) in zip(batch, results):
+                if len(saved) >= max_docs:
+                    break
+                if kind == "pdf":
+                    if value is not None:
+                        print(f"Saved PDF: {value}")
+                        saved.append(value)
+                elif kind == "html":
+                    status = value
+                    if status != 200 or parsed is None:
+                        print(f"Non-200 status {status} for {url}")
+                        continue
+                    text, title, links = parsed
                     if len(text) > 300:  # avoid tiny pages
-                        # Title if any
-                        soup = BeautifulSoup(html, "html.parser")
-                        title_tag = soup.find("title")
-                        title = title_tag.get_text(strip=True) if title_tag else ""
                         base_name = title or urlparse(url).path.split("/")[-1] or "document"
                         out_path = unique_output_path(base_name, extension=".txt")
                         save_text_to_file(text, out_path, title=title)
@@ -180,19 +263,19 @@ def crawl_and_save(max_pages: int, max_docs: int, delay: float) -> List[Path]:
                         saved.append(out_path)
 
                     # Enqueue next links
-                    for link in extract_links(url, html):
+                    for link in links:
                         if link not in visited and link not in queue:
                             queue.append(link)
-        except Exception as e:
-            print(f"Error processing {url}: {e}")
-        finally:
-            pages_processed += 1
-            if delay > 0:
-                time.sleep(delay)
 
+    parse_pool.shutdown()
     return saved
 
 
+def crawl_and_save(max_pages: int, max_docs: int, delay: float) -> List[Path]:
+    """Synchronous entry point wrapping the async crawler."""
+    return asyncio.run(_crawl_and_save(max_pages, max_docs, delay))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Scrape UNICEF and CDC parenting documents to text files")
     parser.add_argument("--max-pages", type=int, default=30, help="Max pages to fetch during crawl")
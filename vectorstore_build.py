@@ -3,33 +3,96 @@ from __future__ import annotations
 from pathlib import Path
 import json
 import chromadb
+import numpy as np
 
-from config import CHROMA_DIR, CHROMA_COLLECTION
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import xxhash
+    _text_hash = xxhash.xxh3_64_intdigest
+except ImportError:
+    _text_hash = hash  # builtin hash: slower on long strings but always available
+
+from config import CHROMA_DIR, CHROMA_COLLECTION, EMBS_FILE, META_FILE
 from embeddings import EmbeddingsWrapper
 
 CHUNKS_FILE = Path("chunks.jsonl")  # Adjust path if needed
+CHUNKS_PARQUET = Path("chunks.parquet")  # Preferred columnar format
+
+
+def chroma_client():
+    """Create the persistent Chroma client.
+
+    Chroma refuses a second client on the same path with different settings,
+    so every module must open the store through this one factory.
+    """
+    return chromadb.PersistentClient(
+        path=str(CHROMA_DIR),
+        settings=chromadb.config.Settings(anonymized_telemetry=False),
+    )
 
 
 def ensure_chroma_collection():
-    client = chromadb.PersistentClient(path=str(CHROMA_DIR))
+    client = chroma_client()
     try:
         return client.get_collection(CHROMA_COLLECTION)
     except Exception:
         return client.create_collection(CHROMA_COLLECTION)
 
 
+def load_chunks_from_parquet() -> list[dict]:
+    """Load preprocessed chunks from the columnar Parquet file."""
+    import pyarrow.parquet as pq
+    return pq.read_table(CHUNKS_PARQUET).to_pylist()
+
+
+def load_chunks() -> list[dict]:
+    """Load preprocessed chunks, preferring Parquet over JSONL.
+
+    Parquet skips per-row JSON parsing entirely and compresses the text
+    column, so it is both smaller on disk and much faster to load.
+    """
+    if CHUNKS_PARQUET.exists():
+        return load_chunks_from_parquet()
+    return load_chunks_from_jsonl()
+
+
 def load_chunks_from_jsonl() -> list[dict]:
     """Load preprocessed chunks from JSONL file."""
     if not CHUNKS_FILE.exists():
         raise FileNotFoundError(f"Missing chunks file: {CHUNKS_FILE}")
 
     chunks = []
-    with CHUNKS_FILE.open("r", encoding="utf-8") as f:
+    with CHUNKS_FILE.open("rb") as f:
         for line in f:
-            chunks.append(json.loads(line.strip()))
+            line = line.strip()
+            if line:
+                chunks.append(_loads(line))
     return chunks
 
 
+def save_faiss_sidecar(ids: list[str], texts: list[str], sources: list[str], embeddings) -> None:
+    """Save embeddings + metadata so rag.retrieve can search with FAISS.
+
+    The embedding matrix goes to a .npy file (memory-mappable float32) and
+    the row-aligned metadata to a small Parquet table.
+    """
+    try:
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("numpy/pyarrow not installed; skipping FAISS sidecar files.")
+        return
+    np.save(EMBS_FILE, np.asarray(embeddings, dtype=np.float32))
+    table = pa.Table.from_pydict({"id": ids, "source": sources, "content": texts})
+    pq.write_table(table, META_FILE, compression="zstd")
+
+
 def build_if_needed(verbose: bool = True):
     CHROMA_DIR.mkdir(exist_ok=True, parents=True)
     collection = ensure_chroma_collection()
@@ -40,9 +103,9 @@ def build_if_needed(verbose: bool = True):
         return collection
 
     if verbose:
-        print("\nBuilding Chroma collection from chunks.jsonl ...")
+        print("\nBuilding Chroma collection from saved chunks ...")
 
-    chunks = load_chunks_from_jsonl()
+    chunks = load_chunks()
     if verbose:
         print(f"  - Loaded {len(chunks)} saved chunks")
 
@@ -53,10 +116,34 @@ def build_if_needed(verbose: bool = True):
     if verbose:
         print(f"  - Generating embeddings...")
 
+    # Embed each distinct text once; scraped pages share boilerplate, and
+    # every duplicate would otherwise cost a full encode for free
+    seen: dict[int, int] = {}
+    unique_texts: list[str] = []
+    mapping: list[int] = []
+    for t in texts:
+        h = _text_hash(t)
+        idx = seen.get(h)
+        if idx is None:
+            idx = len(unique_texts)
+            seen[h] = idx
+            unique_texts.append(t)
+        mapping.append(idx)
+
+    if verbose and len(unique_texts) < len(texts):
+        print(f"  - {len(texts) - len(unique_texts)} duplicate chunks share embeddings")
+
     embedder = EmbeddingsWrapper()
-    embeddings = embedder.embed_documents(texts)
+    embeddings = embedder.embed_documents(unique_texts)
+    if mapping:
+        embeddings = embeddings[np.asarray(mapping, dtype=np.int64)]
+
+    save_faiss_sidecar(ids, texts, [c["source"] for c in chunks], embeddings)
 
-    BATCH_SIZE = 5000
+    # Chroma validates and writes each add() as one sqlite transaction;
+    # ~1000 rows per call stays under its max batch size while keeping the
+    # number of fsyncs low. Embedding slices are zero-copy ndarray views.
+    BATCH_SIZE = 1000
     for i in range(0, len(texts), BATCH_SIZE):
         collection.add(
             documents=texts[i:i + BATCH_SIZE],